@@ -3,7 +3,7 @@ from enum import Enum
 from pathlib import Path
 from typing import List, Union
 
-from ape.utils import extract_nested_value, load_config
+from ape.utils import cached_property, extract_nested_value, load_config
 
 from ape_keyring.config import KeyringConfig
 from ape_keyring.storage import SecretStorage, secret_storage
@@ -30,7 +30,7 @@ class SecretManager:
         for key, value in self._storage:
             self._set(key, value)
 
-    @property
+    @cached_property
     def project_name(self) -> str:
         return self._path.stem
 
@@ -38,7 +38,7 @@ class SecretManager:
     def _project_key_prefix(self) -> str:
         return "<<project="
 
-    @property
+    @cached_property
     def _project_key(self):
         return f"{self._project_key_prefix}{self.project_name}>>"
 
@@ -1,12 +1,25 @@
-from typing import List, Optional
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
-import keyring
 from ape.logging import logger
-from keyring.errors import PasswordDeleteError
 
-SERVICE_NAME = "ape-keyring"
-ACCOUNTS_TRACKER_KEY = "ape-keyring-accounts"
-SECRETS_TRACKER_KEY = "ape-keyring-secrets"
+SERVICE_NAME = sys.intern("ape-keyring")
+ACCOUNTS_TRACKER_KEY = sys.intern("ape-keyring-accounts")
+SECRETS_TRACKER_KEY = sys.intern("ape-keyring-secrets")
+NO_CACHE_ENV_VAR = "APE_KEYRING_NO_CACHE"
+"""Set this environment variable to never hold secrets in process memory."""
+CACHE_TTL_SECONDS = 30.0
+"""How long a value read from keyring is re-used before it is read again."""
+MAX_WORKERS_ENV_VAR = "APE_KEYRING_MAX_WORKERS"
+"""The number of concurrent keyring calls to use when deleting all secrets."""
+_DEFAULT_MAX_WORKERS = 8
+_SECRET_CACHE_MAX_SIZE = 256
+
+# Maps keys to their secret and the time (`monotonic()`) the secret was read.
+_secret_cache: Dict[str, Tuple[Optional[str], float]] = {}
 
 
 class SecretStorage:
@@ -20,10 +33,14 @@ class SecretStorage:
         """
 
         self._tracker_key = tracker_key
+        self._keys_str: Optional[str] = None
+        self._keys_set: Optional[FrozenSet[str]] = None
 
     def __iter__(self):
-        for key in self.keys:
-            yield key, self.get_secret(key)
+        for key in self.keys_set:
+            secret = _get_secret(key)
+            if secret:
+                yield key, secret
 
     @property
     def keys_str(self) -> str:
@@ -37,6 +54,25 @@ class SecretStorage:
 
         return _get_secret(self._tracker_key) or ""
 
+    @property
+    def keys_set(self) -> FrozenSet[str]:
+        """
+        The set of tracked item keys, for fast membership checks. Unlike
+        :meth:`keys`, this does not verify that each secret still exists.
+
+        Returns:
+            FrozenSet[str]
+        """
+
+        # NOTE: The tracker value expires with the rest of the secret cache;
+        #  only re-parse it when it has changed.
+        keys_str = self.keys_str
+        if self._keys_set is None or keys_str != self._keys_str:
+            self._keys_str = keys_str
+            self._keys_set = _parse_keys(keys_str)
+
+        return self._keys_set
+
     @property
     def keys(self) -> List[str]:
         """
@@ -46,13 +82,14 @@ class SecretStorage:
             List[str]
         """
 
-        keys = list(set([k for k in self.keys_str.split(",") if k and _get_secret(k)]))
+        tracked_keys = self.keys_set
+        keys = [k for k in tracked_keys if _get_secret(k)]
 
-        if not keys:
-            return keys
+        # Only re-write the tracker when some secrets were removed externally.
+        if keys and len(keys) != len(tracked_keys):
+            missing_keys = tracked_keys.difference(keys)
+            self._set_keys(self._read_keys() - missing_keys)
 
-        new_keys_str = ",".join(keys)
-        _set_secret(self._tracker_key, new_keys_str)
         return keys
 
     def get_secret(self, key: str) -> Optional[str]:
@@ -66,7 +103,7 @@ class SecretStorage:
         Returns:
             str: The secret value from the OS secure-storage.
         """
-        if key not in self.keys:
+        if key not in self.keys_set:
             return None
 
         return _get_secret(key)
@@ -80,24 +117,61 @@ class SecretStorage:
             secret (str): The value of the secret to store.
         """
 
-        if key not in self.keys:
-            new_keys_str = f"{self.keys_str},{key}" if self.keys_str else key
-            _set_secret(self._tracker_key, new_keys_str)
+        keys = self._read_keys()
+        if key not in keys:
+            self._set_keys(keys | {sys.intern(key)})
 
         _set_secret(key, secret)
 
     def delete_secret(self, key: str):
-        if key in self.keys:
-            new_keys_str = ",".join([k for k in self.keys if k != key])
-            _set_secret(self._tracker_key, new_keys_str)
+        keys = self._read_keys()
+        if key in keys:
+            self._set_keys(keys - {key})
 
         return _delete_secret(key)
 
     def delete_all(self):
-        for key in self.keys:
-            _delete_secret(key)
+        keys = self.keys
+        max_workers = min(len(keys), _get_max_workers())
+        if max_workers > 1:
+            # NOTE: Each delete is an independent keyring round-trip; overlap them.
+            #  keyring does not promise that backends are thread-safe, which is
+            #  why `APE_KEYRING_MAX_WORKERS=1` runs them serially. Clearing the
+            #  secret cache concurrently is safe; `dict.clear()` is atomic.
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                list(pool.map(_delete_secret, keys))
+        else:
+            for key in keys:
+                _delete_secret(key)
 
         _delete_secret(self._tracker_key)
+        self.clear_cache()
+
+    def clear_cache(self):
+        """
+        Forget the parsed tracked keys so that they are parsed again.
+        """
+
+        self._keys_str = None
+        self._keys_set = None
+
+    def _read_keys(self) -> FrozenSet[str]:
+        # NOTE: Bypass all caches and read what is actually stored. Use this
+        #  before writing the tracker so that keys added by other processes
+        #  are not lost.
+        return _parse_keys(_read_secret(self._tracker_key) or "")
+
+    def _set_keys(self, keys: FrozenSet[str]):
+        keys_str = ",".join(keys)
+        _set_secret(self._tracker_key, keys_str)
+
+        # NOTE: `_set_secret()` ignores empty values, so leave the cache
+        #  unset in that case to re-read what is actually stored.
+        if keys_str:
+            self._keys_str = keys_str
+            self._keys_set = keys
+        else:
+            self.clear_cache()
 
 
 account_storage = SecretStorage(ACCOUNTS_TRACKER_KEY)
@@ -107,7 +181,64 @@ secret_storage = SecretStorage(SECRETS_TRACKER_KEY)
 """A storage class for storing secrets."""
 
 
+def clear_caches():
+    """
+    Clear all in-process caches of keyring data, such as after changing the
+    keyring backend.
+    """
+
+    _secret_cache.clear()
+    account_storage.clear_cache()
+    secret_storage.clear_cache()
+
+
+def _use_cache() -> bool:
+    value = os.environ.get(NO_CACHE_ENV_VAR, "").strip().lower()
+    return value in ("", "0", "false", "no")
+
+
+def _get_max_workers() -> int:
+    value = os.environ.get(MAX_WORKERS_ENV_VAR, "").strip()
+    if not value:
+        return _DEFAULT_MAX_WORKERS
+
+    try:
+        return max(int(value), 1)
+    except ValueError:
+        logger.warning(f"Invalid {MAX_WORKERS_ENV_VAR} value '{value}'. Using 1.")
+        return 1
+
+
+def _parse_keys(keys_str: str) -> FrozenSet[str]:
+    return frozenset(sys.intern(k) for k in keys_str.split(",") if k)
+
+
 def _get_secret(key: str) -> Optional[str]:
+    if not _use_cache():
+        return _read_secret(key)
+
+    return _get_cached_secret(key)
+
+
+def _get_cached_secret(key: str) -> Optional[str]:
+    now = monotonic()
+    cached = _secret_cache.get(key)
+    if cached is not None and now - cached[1] < CACHE_TTL_SECONDS:
+        return cached[0]
+
+    secret = _read_secret(key)
+    if key not in _secret_cache and len(_secret_cache) >= _SECRET_CACHE_MAX_SIZE:
+        # Evict the oldest entry.
+        _secret_cache.pop(next(iter(_secret_cache)), None)
+
+    _secret_cache[key] = (secret, now)
+    return secret
+
+
+def _read_secret(key: str) -> Optional[str]:
+    # NOTE: `keyring` is imported lazily to keep it off CLI start-up.
+    import keyring
+
     try:
         return keyring.get_password(SERVICE_NAME, key)
     except KeyError:
@@ -118,16 +249,24 @@ def _set_secret(key: str, secret: str):
     if not key or not secret:
         return
 
+    import keyring
+
     keyring.set_password(SERVICE_NAME, key, secret)
+    _secret_cache.clear()
 
 
 def _delete_secret(key: str):
     if not key:
         return False
 
+    import keyring
+    from keyring.errors import PasswordDeleteError
+
     try:
         keyring.delete_password(SERVICE_NAME, key)
         return True
     except PasswordDeleteError as err:
         logger.debug(err)
         return False
+    finally:
+        _secret_cache.clear()
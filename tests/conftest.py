@@ -4,12 +4,14 @@ from ape import accounts
 from ape._cli import cli as root_cli
 from click.testing import CliRunner
 
+from ape_keyring.storage import clear_caches
 from ape_keyring.testing import MockBackend
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="session", autouse=True)
 def mock_keyring_backend():
     keyring.set_keyring(MockBackend())
+    clear_caches()
 
 
 @pytest.fixture
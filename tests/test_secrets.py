@@ -1,9 +1,40 @@
+import os
+import time
+from pathlib import Path
+
 import pytest
 
-from ape_keyring._secrets import secret_storage
+from ape_keyring._secrets import Scope, SecretManager, secret_storage
+from ape_keyring import storage as keyring_storage
+from ape_keyring.storage import (
+    CACHE_TTL_SECONDS,
+    MAX_WORKERS_ENV_VAR,
+    NO_CACHE_ENV_VAR,
+    SECRETS_TRACKER_KEY,
+    SecretStorage,
+)
+from ape_keyring.testing import MockBackend
 
 SECRET_KEY = "TEST_SECRET"
 SECRET_VALUE = "this-is-a-test-secret"
+OTHER_SECRET_KEY = "TEST_OTHER_SECRET"
+OTHER_SECRET_VALUE = "this-is-another-test-secret"
+ENV_SECRET_KEYS = {Scope.GLOBAL: "TEST_GLOBAL_ENV_SECRET", Scope.PROJECT: "TEST_PROJECT_ENV_SECRET"}
+
+
+@pytest.fixture
+def env_secret_manager():
+    config = {"keyring": {"set_env_vars": True}}
+    secret_manager = SecretManager(Path.cwd(), secret_storage, config)  # type: ignore
+
+    yield secret_manager
+
+    for scope, key in ENV_SECRET_KEYS.items():
+        storage_key = secret_manager._get_key(key, scope)
+        if storage_key in secret_storage.keys:
+            secret_storage.delete_secret(storage_key)
+
+        os.environ.pop(key, None)
 
 
 @pytest.fixture
@@ -37,3 +68,119 @@ def test_delete(cli, runner, temp_secret):
 
     result = runner.invoke(cli, ["keyring", "secrets", "list"])
     assert SECRET_KEY not in result.output
+
+
+def test_secret_cache(temp_secret, monkeypatch):
+    monkeypatch.delenv(NO_CACHE_ENV_VAR, raising=False)
+    assert secret_storage.get_secret(SECRET_KEY) == SECRET_VALUE
+
+    # Simulate changes made by another process.
+    tracked_keys = secret_storage.keys_set | {OTHER_SECRET_KEY}
+    MockBackend._storage[SECRET_KEY] = OTHER_SECRET_VALUE
+    MockBackend._storage[OTHER_SECRET_KEY] = OTHER_SECRET_VALUE
+    MockBackend._storage[SECRETS_TRACKER_KEY] = ",".join(tracked_keys)
+
+    try:
+        # Cached by default.
+        assert secret_storage.get_secret(SECRET_KEY) == SECRET_VALUE
+        assert secret_storage.get_secret(OTHER_SECRET_KEY) is None
+        monkeypatch.setenv(NO_CACHE_ENV_VAR, "0")
+        assert secret_storage.get_secret(SECRET_KEY) == SECRET_VALUE
+
+        # Opted out.
+        monkeypatch.setenv(NO_CACHE_ENV_VAR, "1")
+        assert secret_storage.get_secret(SECRET_KEY) == OTHER_SECRET_VALUE
+        assert secret_storage.get_secret(OTHER_SECRET_KEY) == OTHER_SECRET_VALUE
+
+    finally:
+        secret_storage.delete_secret(OTHER_SECRET_KEY)
+
+
+def test_secret_cache_expires(temp_secret, monkeypatch):
+    monkeypatch.delenv(NO_CACHE_ENV_VAR, raising=False)
+    now = time.monotonic()
+    monkeypatch.setattr(keyring_storage, "monotonic", lambda: now)
+    assert secret_storage.get_secret(SECRET_KEY) == SECRET_VALUE
+
+    # Simulate a change made by another process.
+    MockBackend._storage[SECRET_KEY] = OTHER_SECRET_VALUE
+    assert secret_storage.get_secret(SECRET_KEY) == SECRET_VALUE
+
+    monkeypatch.setattr(keyring_storage, "monotonic", lambda: now + CACHE_TTL_SECONDS)
+    assert secret_storage.get_secret(SECRET_KEY) == OTHER_SECRET_VALUE
+
+
+def test_tracker_cache_expires(temp_secret, monkeypatch):
+    monkeypatch.delenv(NO_CACHE_ENV_VAR, raising=False)
+    now = time.monotonic()
+    monkeypatch.setattr(keyring_storage, "monotonic", lambda: now)
+    assert secret_storage.get_secret(OTHER_SECRET_KEY) is None
+
+    # Simulate a secret stored by another process.
+    tracked_keys = secret_storage.keys_set | {OTHER_SECRET_KEY}
+    MockBackend._storage[OTHER_SECRET_KEY] = OTHER_SECRET_VALUE
+    MockBackend._storage[SECRETS_TRACKER_KEY] = ",".join(tracked_keys)
+
+    try:
+        monkeypatch.setattr(keyring_storage, "monotonic", lambda: now + CACHE_TTL_SECONDS)
+        assert secret_storage.get_secret(OTHER_SECRET_KEY) == OTHER_SECRET_VALUE
+
+    finally:
+        secret_storage.delete_secret(OTHER_SECRET_KEY)
+
+
+def test_store_and_delete_keep_external_keys(temp_secret):
+    # Warm the cache.
+    assert secret_storage.get_secret(SECRET_KEY) == SECRET_VALUE
+
+    # Simulate a secret stored by another process.
+    tracked_keys = secret_storage.keys_set | {OTHER_SECRET_KEY}
+    MockBackend._storage[OTHER_SECRET_KEY] = OTHER_SECRET_VALUE
+    MockBackend._storage[SECRETS_TRACKER_KEY] = ",".join(tracked_keys)
+    new_key = "TEST_NEW_SECRET"
+
+    try:
+        secret_storage.store_secret(new_key, SECRET_VALUE)
+        stored_keys = MockBackend._storage[SECRETS_TRACKER_KEY].split(",")
+        assert OTHER_SECRET_KEY in stored_keys
+        assert new_key in stored_keys
+
+        secret_storage.delete_secret(new_key)
+        stored_keys = MockBackend._storage[SECRETS_TRACKER_KEY].split(",")
+        assert OTHER_SECRET_KEY in stored_keys
+        assert new_key not in stored_keys
+
+    finally:
+        for key in (new_key, OTHER_SECRET_KEY):
+            if key in secret_storage.keys:
+                secret_storage.delete_secret(key)
+
+
+def test_secrets_in_env(env_secret_manager):
+    for scope, key in ENV_SECRET_KEYS.items():
+        env_secret_manager.store_secret(key, SECRET_VALUE, scope=scope)
+
+    for key in ENV_SECRET_KEYS.values():
+        assert os.environ.get(key) == SECRET_VALUE
+
+    for scope, key in ENV_SECRET_KEYS.items():
+        assert env_secret_manager.delete_secret(key, scope=scope)
+
+    for key in ENV_SECRET_KEYS.values():
+        assert key not in os.environ
+
+
+@pytest.mark.parametrize("max_workers", ("1", "8"))
+def test_delete_all(monkeypatch, max_workers):
+    monkeypatch.setenv(MAX_WORKERS_ENV_VAR, max_workers)
+    tracker_key = "ape-keyring-test-delete-all"
+    storage = SecretStorage(tracker_key)
+    keys = [f"TEST_DELETE_ALL_{i}" for i in range(12)]
+    for key in keys:
+        storage.store_secret(key, SECRET_VALUE)
+
+    storage.delete_all()
+
+    assert not any(key in MockBackend._storage for key in keys)
+    assert tracker_key not in MockBackend._storage
+    assert storage.keys == []